@@ -2,20 +2,215 @@ from __future__ import annotations
 
 import json
 import logging
+import operator
 import os
 import sys
-from urllib.parse import urlparse
+import typing as t
 
 import click
-import rich
+
+if t.TYPE_CHECKING:
+    P = t.ParamSpec("P")
+    F = t.Callable[P, t.Any]
+
+    start_command: click.Group
 
 logger = logging.getLogger(__name__)
 
 
+def _container_default(path: str) -> t.Callable[[], t.Any]:
+    """
+    Return a click default that reads ``path`` from ``BentoMLContainer`` on demand
+    instead of when the command is built. The value is read when the command's
+    arguments are parsed, or when its ``--help`` is rendered for options using
+    ``_ResolvedDefaultOption``.
+    """
+
+    def getter() -> t.Any:
+        from bentoml._internal.configuration.containers import BentoMLContainer
+
+        return operator.attrgetter(path)(BentoMLContainer).get()
+
+    return getter
+
+
+class _ResolvedDefaultOption(click.Option):
+    """
+    Option that resolves a callable default while rendering ``--help``, so the help
+    text shows the effective value instead of ``(dynamic)``.
+    """
+
+    def get_help_record(self, ctx: click.Context) -> tuple[str, str] | None:
+        default = self.default
+        if callable(default):
+            self.default = default()
+        try:
+            return super().get_help_record(ctx)
+        finally:
+            self.default = default
+
+
+def _latest_protocol_version() -> str:
+    from bentoml.grpc.utils import LATEST_PROTOCOL_VERSION
+
+    return LATEST_PROTOCOL_VERSION
+
+
+def _resolve_working_dir(bento: str, working_dir: str | None) -> str:
+    """
+    Return the directory to load the service from. Without an explicit
+    ``--working-dir``, ``bento`` is used when it is a directory, otherwise the
+    current directory. A value containing ``:`` but no drive or path separator,
+    such as ``proj:v2``, is taken as a bento tag without checking the filesystem,
+    so a relative directory with such a name needs ``--working-dir`` or a ``./``
+    prefix.
+    """
+    if working_dir is not None:
+        return working_dir
+    if "~" in bento:
+        bento = os.path.expanduser(bento)
+    elif (
+        ":" in bento
+        and not os.path.splitdrive(bento)[0]
+        and os.sep not in bento
+        and (os.altsep is None or os.altsep not in bento)
+    ):
+        # a bento tag such as ``iris:latest``, no need to stat it
+        return "."
+    return bento if os.path.isdir(bento) else "."
+
+
+def _ensure_on_syspath(working_dir: str) -> None:
+    # move working_dir to the front so it wins on import, dropping any earlier
+    # copy so repeated invocations in one process don't keep growing sys.path
+    if sys.path[0] != working_dir:
+        while working_dir in sys.path:
+            sys.path.remove(working_dir)
+        sys.path.insert(0, working_dir)
+
+
+def _parse_tcp_bind(bind: str) -> tuple[str | None, int | None]:
+    """
+    Split a ``tcp://host:port`` bind address into host and port. Either part is
+    ``None`` when missing. Like ``urlparse``, any userinfo and trailing path are
+    ignored and hostnames are lowercased.
+    """
+    if not bind.startswith("tcp://"):
+        raise click.BadParameter(
+            f"invalid bind address {bind!r}: only tcp:// addresses are supported"
+        )
+    netloc = bind[len("tcp://") :]
+    for delim in "/?#":
+        netloc = netloc.partition(delim)[0]
+    netloc = netloc.rpartition("@")[2]
+    host, sep, port = netloc.rpartition(":")
+    if not sep or port.endswith("]"):
+        # no port, possibly a bare IPv6 address such as ``[::1]``
+        host, port = netloc, ""
+    if host.startswith("["):
+        host = host[1:-1] if host.endswith("]") else ""
+    elif ":" in host:
+        raise click.BadParameter(
+            f"invalid bind address {bind!r}: IPv6 hosts must be enclosed in brackets"
+        )
+    if not port:
+        return host.lower() or None, None
+    if not (port.isascii() and port.isdigit()) or not 0 <= int(port) <= 65535:
+        raise click.BadParameter(
+            f"invalid bind address {bind!r}: port must be an integer in 0-65535"
+        )
+    return host.lower() or None, int(port)
+
+
+def _parse_depends(depends: t.Iterable[str]) -> dict[str, str]:
+    """
+    Build the runner map from ``NAME=ADDRESS`` entries. Only the first ``=`` is a
+    separator, so addresses may contain ``=`` themselves.
+    """
+    runner_map: dict[str, str] = {}
+    for s in depends:
+        name, sep, address = s.partition("=")
+        if not sep:
+            raise click.BadParameter(f"expected NAME=ADDRESS, got {s!r}")
+        runner_map[name] = address
+    return runner_map
+
+
+def _prepare_start_env(
+    bento: str,
+    working_dir: str | None,
+    *,
+    host: str | None = None,
+    port: int | None = None,
+    bind: str | None = None,
+    depends: t.Sequence[str] = (),
+    runner_map: str | None = None,
+) -> tuple[str, t.Any, t.Any, dict[str, str]]:
+    """
+    Common preamble of the ``start-*`` commands: resolve the working directory and
+    put it on ``sys.path``, apply the deprecated ``--bind`` address to host/port and
+    build the runner map from ``--depends`` or the legacy ``--runner-map``.
+    """
+    working_dir = _resolve_working_dir(bento, working_dir)
+    _ensure_on_syspath(working_dir)
+
+    if bind is not None:
+        bind_host, bind_port = _parse_tcp_bind(bind)
+        host = bind_host or host
+        port = bind_port or port
+
+    if depends:
+        runner_map_dict = _parse_depends(depends)
+    elif runner_map:
+        if runner_map.startswith("@"):
+            path = runner_map[1:]
+            try:
+                with open(path, encoding="utf-8") as f:
+                    runner_map_dict = json.load(f)
+            except (OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+                raise click.BadParameter(
+                    f"cannot load runner map from {path!r}: {e}",
+                    param_hint="--runner-map",
+                ) from e
+        else:
+            try:
+                from orjson import loads as json_loads
+            except ImportError:
+                json_loads = json.loads
+            runner_map_dict = json_loads(runner_map)
+    else:
+        runner_map_dict = {}
+
+    return working_dir, host, port, runner_map_dict
+
+
+def ssl_options_group(f: F[t.Any]):
+    ssl = [
+        click.option("--ssl-certfile", type=str, help="SSL certificate file"),
+        click.option("--ssl-keyfile", type=str, help="SSL key file"),
+        click.option("--ssl-keyfile-password", type=str, help="SSL keyfile password"),
+        click.option(
+            "--ssl-version",
+            type=int,
+            help="SSL version to use (see stdlib 'ssl' module)",
+        ),
+        click.option(
+            "--ssl-cert-reqs",
+            type=int,
+            help="Whether client certificate is required (see stdlib 'ssl' module)",
+        ),
+        click.option("--ssl-ca-certs", type=str, help="CA certificates file"),
+        click.option(
+            "--ssl-ciphers", type=str, help="Ciphers to use (see stdlib 'ssl' module)"
+        ),
+    ]
+    for options in reversed(ssl):
+        f = options(f)
+    return f
+
+
 def build_start_command() -> click.Group:
-    from bentoml._internal.configuration.containers import BentoMLContainer
     from bentoml._internal.utils import add_experimental_docstring
-    from bentoml.grpc.utils import LATEST_PROTOCOL_VERSION
     from bentoml_cli.utils import BentoMLCommandGroup
 
     @click.group(name="start", cls=BentoMLCommandGroup)
@@ -44,7 +239,8 @@ def build_start_command() -> click.Group:
         type=click.STRING,
         envvar="BENTOML_SERVE_RUNNER_MAP",
         help="[Deprecated] use --depends instead. "
-        "JSON string of runners map. For backword compatibility for yatai < 1.0.0",
+        "JSON string of runners map, or '@<path>' to read it from a JSON file. "
+        "For backword compatibility for yatai < 1.0.0",
     )
     @click.option(
         "--bind",
@@ -86,26 +282,13 @@ def build_start_command() -> click.Group:
     )
     @click.option(
         "--working-dir",
-        type=click.Path(),
+        type=click.STRING,
+        metavar="PATH",
         help="When loading from source code, specify the directory to find the Service instance",
         default=None,
         show_default=True,
     )
-    @click.option("--ssl-certfile", type=str, help="SSL certificate file")
-    @click.option("--ssl-keyfile", type=str, help="SSL key file")
-    @click.option("--ssl-keyfile-password", type=str, help="SSL keyfile password")
-    @click.option(
-        "--ssl-version", type=int, help="SSL version to use (see stdlib 'ssl' module)"
-    )
-    @click.option(
-        "--ssl-cert-reqs",
-        type=int,
-        help="Whether client certificate is required (see stdlib 'ssl' module)",
-    )
-    @click.option("--ssl-ca-certs", type=str, help="CA certificates file")
-    @click.option(
-        "--ssl-ciphers", type=str, help="Ciphers to use (see stdlib 'ssl' module)"
-    )
+    @ssl_options_group
     @click.option(
         "--timeout-keep-alive",
         type=int,
@@ -127,7 +310,7 @@ def build_start_command() -> click.Group:
     def start_http_server(  # type: ignore (unused warning)
         bento: str,
         service_name: str,
-        depends: list[str] | None,
+        depends: tuple[str, ...],
         runner_map: str | None,
         bind: str | None,
         port: int | None,
@@ -153,25 +336,15 @@ def build_start_command() -> click.Group:
         from bentoml._internal.service.loader import load
         from bentoml.legacy import Service
 
-        if working_dir is None:
-            if os.path.isdir(os.path.expanduser(bento)):
-                working_dir = os.path.expanduser(bento)
-            else:
-                working_dir = "."
-        if sys.path[0] != working_dir:
-            sys.path.insert(0, working_dir)
-        if depends:
-            runner_map_dict = dict([s.split("=", maxsplit=2) for s in depends or []])
-        elif runner_map:
-            runner_map_dict = json.loads(runner_map)
-        else:
-            runner_map_dict = {}
-
-        if bind is not None:
-            parsed = urlparse(bind)
-            assert parsed.scheme == "tcp"
-            host = parsed.hostname or host
-            port = parsed.port or port
+        working_dir, host, port, runner_map_dict = _prepare_start_env(
+            bento,
+            working_dir,
+            host=host,
+            port=port,
+            bind=bind,
+            depends=depends,
+            runner_map=runner_map,
+        )
 
         svc = load(bento, working_dir=working_dir)
         if isinstance(svc, Service):
@@ -181,8 +354,10 @@ def build_start_command() -> click.Group:
             if not service_name or service_name == svc.name:
                 from bentoml.start import start_http_server
 
-                for dep in depends or []:
-                    rich.print(f"Using remote: {dep}")
+                if depends:
+                    import rich
+
+                    rich.print("\n".join(f"Using remote: {dep}" for dep in depends))
                 start_http_server(
                     bento,
                     runner_map=runner_map_dict,
@@ -205,12 +380,6 @@ def build_start_command() -> click.Group:
             else:
                 from bentoml.start import start_runner_server
 
-                if bind is not None:
-                    parsed = urlparse(bind)
-                    assert parsed.scheme == "tcp"
-                    host = parsed.hostname or host
-                    port = parsed.port or port
-
                 start_runner_server(
                     bento,
                     runner_name=service_name,
@@ -258,28 +427,31 @@ def build_start_command() -> click.Group:
     @click.option(
         "--port",
         type=click.INT,
-        default=BentoMLContainer.grpc.port.get(),
+        default=_container_default("grpc.port"),
         help="The port to listen on for the gRPC server",
         envvar="BENTOML_PORT",
         show_default=True,
+        cls=_ResolvedDefaultOption,
     )
     @click.option(
         "--host",
         type=click.STRING,
-        default=BentoMLContainer.grpc.host.get(),
+        default=_container_default("grpc.host"),
         help="The host to bind for the gRPC server (defaults: 0.0.0.0)",
         envvar="BENTOML_HOST",
     )
     @click.option(
         "--backlog",
         type=click.INT,
-        default=BentoMLContainer.api_server_config.backlog.get(),
+        default=_container_default("api_server_config.backlog"),
         help="The maximum number of pending connections.",
         show_default=True,
+        cls=_ResolvedDefaultOption,
     )
     @click.option(
         "--working-dir",
-        type=click.Path(),
+        type=click.STRING,
+        metavar="PATH",
         help="When loading from source code, specify the directory to find the Service instance",
         default=None,
         show_default=True,
@@ -287,46 +459,48 @@ def build_start_command() -> click.Group:
     @click.option(
         "--api-workers",
         type=click.INT,
-        default=BentoMLContainer.api_server_workers.get(),
+        default=_container_default("api_server_workers"),
         help="Specify the number of API server workers to start. Default to number of available CPU cores in production mode",
         envvar="BENTOML_API_WORKERS",
     )
     @click.option(
         "--enable-reflection",
         is_flag=True,
-        default=BentoMLContainer.grpc.reflection.enabled.get(),
+        flag_value=True,
+        default=_container_default("grpc.reflection.enabled"),
         type=click.BOOL,
         help="Enable reflection.",
     )
     @click.option(
         "--enable-channelz",
         is_flag=True,
-        default=BentoMLContainer.grpc.channelz.enabled.get(),
+        flag_value=True,
+        default=_container_default("grpc.channelz.enabled"),
         type=click.BOOL,
         help="Enable Channelz. See https://github.com/grpc/proposal/blob/master/A14-channelz.md.",
     )
     @click.option(
         "--max-concurrent-streams",
-        default=BentoMLContainer.grpc.max_concurrent_streams.get(),
+        default=_container_default("grpc.max_concurrent_streams"),
         type=click.INT,
         help="Maximum number of concurrent incoming streams to allow on a http2 connection.",
     )
     @click.option(
         "--ssl-certfile",
         type=str,
-        default=BentoMLContainer.ssl.certfile.get(),
+        default=_container_default("ssl.certfile"),
         help="SSL certificate file",
     )
     @click.option(
         "--ssl-keyfile",
         type=str,
-        default=BentoMLContainer.ssl.keyfile.get(),
+        default=_container_default("ssl.keyfile"),
         help="SSL key file",
     )
     @click.option(
         "--ssl-ca-certs",
         type=str,
-        default=BentoMLContainer.ssl.ca_certs.get(),
+        default=_container_default("ssl.ca_certs"),
         help="CA certificates file",
     )
     @click.option(
@@ -334,13 +508,14 @@ def build_start_command() -> click.Group:
         "--protocol-version",
         type=click.Choice(["v1", "v1alpha1"]),
         help="Determine the version of generated gRPC stubs to use.",
-        default=LATEST_PROTOCOL_VERSION,
+        default=_latest_protocol_version,
         show_default=True,
+        cls=_ResolvedDefaultOption,
     )
     @add_experimental_docstring
     def start_grpc_server(  # type: ignore (unused warning)
         bento: str,
-        remote_runner: list[str] | None,
+        remote_runner: tuple[str, ...],
         port: int,
         host: str,
         backlog: int,
@@ -357,17 +532,14 @@ def build_start_command() -> click.Group:
         """
         Start a gRPC API server standalone. This will be used inside Yatai.
         """
-        if working_dir is None:
-            if os.path.isdir(os.path.expanduser(bento)):
-                working_dir = os.path.expanduser(bento)
-            else:
-                working_dir = "."
-        if sys.path[0] != working_dir:
-            sys.path.insert(0, working_dir)
+        working_dir, host, port, runner_map = _prepare_start_env(
+            bento, working_dir, host=host, port=port, depends=remote_runner
+        )
+
+        import rich
 
         from bentoml.start import start_grpc_server
 
-        runner_map = dict([s.split("=", maxsplit=2) for s in remote_runner or []])
         rich.print(f"Using remote runners: {runner_map}")
         start_grpc_server(
             bento,
@@ -405,28 +577,31 @@ def build_start_command() -> click.Group:
     @click.option(
         "--port",
         type=click.INT,
-        default=BentoMLContainer.http.port.get(),
+        default=_container_default("http.port"),
         help="The port to listen on for the REST api server",
         envvar="BENTOML_PORT",
         show_default=True,
+        cls=_ResolvedDefaultOption,
     )
     @click.option(
         "--host",
         type=click.STRING,
-        default=BentoMLContainer.http.host.get(),
+        default=_container_default("http.host"),
         help="The host to bind for the REST api server [defaults: 127.0.0.1(dev), 0.0.0.0(production)]",
         envvar="BENTOML_HOST",
     )
     @click.option(
         "--backlog",
         type=click.INT,
-        default=BentoMLContainer.api_server_config.backlog.get(),
+        default=_container_default("api_server_config.backlog"),
         help="The maximum number of pending connections.",
         show_default=True,
+        cls=_ResolvedDefaultOption,
     )
     @click.option(
         "--working-dir",
-        type=click.Path(),
+        type=click.STRING,
+        metavar="PATH",
         help="When loading from source code, specify the directory to find the Service instance",
         default=None,
         show_default=True,
@@ -451,28 +626,12 @@ def build_start_command() -> click.Group:
         """
         Start Runner server standalone. Deprecate in 1.2.0
         """
-        if working_dir is None:
-            if os.path.isdir(os.path.expanduser(bento)):
-                working_dir = os.path.expanduser(bento)
-            else:
-                working_dir = "."
-        if sys.path[0] != working_dir:
-            sys.path.insert(0, working_dir)
-
-        if bind is not None:
-            parsed = urlparse(bind)
-            assert parsed.scheme == "tcp"
-            host = parsed.hostname or host
-            port = parsed.port or port
+        working_dir, host, port, _ = _prepare_start_env(
+            bento, working_dir, host=host, port=port, bind=bind
+        )
 
         from bentoml.start import start_runner_server as start_runner_server_impl
 
-        if bind is not None:
-            parsed = urlparse(bind)
-            assert parsed.scheme == "tcp"
-            host = parsed.hostname or host
-            port = parsed.port or port
-
         start_runner_server_impl(
             bento,
             runner_name=runner_name,
@@ -486,8 +645,15 @@ def build_start_command() -> click.Group:
     return cli
 
 
-start_command = build_start_command()
+def __getattr__(name: str) -> t.Any:
+    # build the command group on first access instead of at import time
+    if name == "start_command":
+        global start_command
+        start_command = build_start_command()
+        return start_command
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
-    start_command()
+    # module-level __getattr__ is not consulted for lookups inside the module
+    build_start_command()()
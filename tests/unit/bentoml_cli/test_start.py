@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import json
+import ntpath
+import os
+import sys
+from pathlib import Path
+
+import click
+import pytest
+
+from bentoml_cli._internal.start import _ensure_on_syspath
+from bentoml_cli._internal.start import _parse_depends
+from bentoml_cli._internal.start import _parse_tcp_bind
+from bentoml_cli._internal.start import _prepare_start_env
+from bentoml_cli._internal.start import _resolve_working_dir
+
+testdata = [
+    ("tcp://0.0.0.0:3000", ("0.0.0.0", 3000)),
+    ("tcp://localhost:3001", ("localhost", 3001)),
+    ("tcp://[::1]:3000", ("::1", 3000)),
+    ("tcp://[::1]", ("::1", None)),
+    ("tcp://127.0.0.1", ("127.0.0.1", None)),
+    ("tcp://:3000", (None, 3000)),
+    ("tcp://0.0.0.0:3000/", ("0.0.0.0", 3000)),
+    ("tcp://[::1]:3000/path?query", ("::1", 3000)),
+    ("tcp://LocalHost:3000", ("localhost", 3000)),
+    ("tcp://0.0.0.0:65535", ("0.0.0.0", 65535)),
+    ("tcp://user@Host:4000", ("host", 4000)),
+    ("tcp://user:p@ss@[::1]:4000/", ("::1", 4000)),
+]
+
+
+@pytest.mark.parametrize("bind, expected", testdata)
+def test_parse_tcp_bind(bind: str, expected: tuple[str | None, int | None]):
+    assert _parse_tcp_bind(bind) == expected
+
+
+def test_parse_tcp_bind_rejects_other_schemes():
+    with pytest.raises(click.BadParameter, match="only tcp:// addresses"):
+        _parse_tcp_bind("unix:///tmp/bentoml.sock")
+
+
+@pytest.mark.parametrize(
+    "bind",
+    ["tcp://0.0.0.0:99999", "tcp://0.0.0.0:-1", "tcp://0.0.0.0:http", "tcp://::1"],
+)
+def test_parse_tcp_bind_rejects_invalid_address(bind: str):
+    with pytest.raises(click.BadParameter, match="invalid bind address"):
+        _parse_tcp_bind(bind)
+
+
+@pytest.mark.parametrize(
+    "depends, expected",
+    [
+        ((), {}),
+        (("a=tcp://127.0.0.1:3001",), {"a": "tcp://127.0.0.1:3001"}),
+        (
+            ("a=http://host:3000/?x=1&y=2", "b=tcp://127.0.0.1:3002"),
+            {"a": "http://host:3000/?x=1&y=2", "b": "tcp://127.0.0.1:3002"},
+        ),
+    ],
+)
+def test_parse_depends(depends: tuple[str, ...], expected: dict[str, str]):
+    assert _parse_depends(depends) == expected
+
+
+@pytest.mark.parametrize("depends", [("foo",), ("a=tcp://127.0.0.1:3001", "foo")])
+def test_parse_depends_rejects_missing_separator(depends: tuple[str, ...]):
+    with pytest.raises(click.BadParameter, match="expected NAME=ADDRESS"):
+        _parse_depends(depends)
+
+
+def test_ensure_on_syspath_keeps_latest_first(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(sys, "path", ["/site-packages"])
+    for working_dir in ("/a", "/b", "/a"):
+        _ensure_on_syspath(working_dir)
+    assert sys.path == ["/a", "/b", "/site-packages"]
+    _ensure_on_syspath("/a")
+    assert sys.path == ["/a", "/b", "/site-packages"]
+
+
+@pytest.fixture(name="isdir_calls")
+def fixture_isdir_calls(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+    isdir = os.path.isdir
+
+    def recording_isdir(path: str) -> bool:
+        calls.append(path)
+        return isdir(path)
+
+    monkeypatch.setattr(os.path, "isdir", recording_isdir)
+    return calls
+
+
+@pytest.mark.parametrize(
+    "bento, working_dir, expected, stat",
+    [
+        ("iris:latest", None, ".", False),
+        ("iris:latest", "/srv/bento", "/srv/bento", False),
+        ("proj", "/srv/bento", "/srv/bento", False),
+        ("proj", None, "proj", True),
+        ("missing", None, ".", True),
+        ("./proj:v2", None, ".", True),
+    ],
+)
+def test_resolve_working_dir(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    isdir_calls: list[str],
+    bento: str,
+    working_dir: str | None,
+    expected: str,
+    stat: bool,
+):
+    (tmp_path / "proj").mkdir()
+    monkeypatch.chdir(tmp_path)
+    assert _resolve_working_dir(bento, working_dir) == expected
+    assert bool(isdir_calls) is stat
+
+
+def test_resolve_working_dir_expands_user(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    (tmp_path / "x").mkdir()
+    monkeypatch.setenv("HOME", str(tmp_path))
+    assert _resolve_working_dir("~/x", None) == str(tmp_path / "x")
+    assert _resolve_working_dir("~/missing", None) == "."
+
+
+@pytest.mark.parametrize(
+    "bento, expected",
+    [
+        ("C:/Users/me/proj", "C:/Users/me/proj"),
+        ("C:\\Users\\me\\proj", "C:\\Users\\me\\proj"),
+        ("iris:latest", "."),
+    ],
+)
+def test_resolve_working_dir_windows_paths(
+    monkeypatch: pytest.MonkeyPatch, bento: str, expected: str
+):
+    calls: list[str] = []
+
+    def isdir(path: str) -> bool:
+        calls.append(path)
+        return True
+
+    monkeypatch.setattr(os, "sep", "\\")
+    monkeypatch.setattr(os, "altsep", "/")
+    monkeypatch.setattr(os.path, "splitdrive", ntpath.splitdrive)
+    monkeypatch.setattr(os.path, "isdir", isdir)
+    assert _resolve_working_dir(bento, None) == expected
+    assert calls == ([] if expected == "." else [bento])
+
+
+def test_prepare_start_env_runner_map_from_file(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    runner_map = {"iris_clf": "tcp://127.0.0.1:3001", "other": "http://h:3002/?a=b"}
+    path = tmp_path / "runner_map.json"
+    path.write_text(json.dumps(runner_map), encoding="utf-8")
+    working_dir, _, _, result = _prepare_start_env(
+        "iris:latest", str(tmp_path), runner_map="@" + str(path)
+    )
+    assert working_dir == str(tmp_path)
+    assert result == runner_map
+
+
+@pytest.mark.parametrize("content", [None, "{not json", b"\xff\xfe"])
+def test_prepare_start_env_runner_map_file_errors(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, content: str | bytes | None
+):
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    path = tmp_path / "runner_map.json"
+    if isinstance(content, str):
+        path.write_text(content, encoding="utf-8")
+    elif isinstance(content, bytes):
+        path.write_bytes(content)
+    with pytest.raises(click.BadParameter, match="cannot load runner map"):
+        _prepare_start_env("iris:latest", str(tmp_path), runner_map="@" + str(path))